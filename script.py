@@ -1,10 +1,45 @@
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import orjson
 from typing import Dict, Optional, Union
+import glob
+import logging
 import os
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import time
 from config import ORIGINALITY_AI_API_KEY, RESULTS_DIR
 
+logger = logging.getLogger(__name__)
+
+# scan_type -> (ai detection on, plagiarism on)
+_SCAN_FLAGS = {"ai": (True, False), "plagiarism": (False, True), "all": (True, True)}
+
+# directories already created this process, so batch saves skip the stat syscall
+_dirs_ensured = set()
+
+def _write_bytes(path: str, data: bytes):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+# scan bodies with content above this many characters stream as chunked uploads
+_STREAM_THRESHOLD = 1 << 20
+_STREAM_CHUNK = 64 * 1024
+
+def _iter_json_body(meta: Dict, field: str, text: str):
+    """
+    Yield the scan payload as JSON chunks, streaming one large string field.
+    Escapes the text in 64 KB slices so the peak memory stays near one chunk
+    instead of a second full copy of the document.
+    """
+    head = orjson.dumps(meta)[:-1]  # drop the closing brace
+    yield head + b',"' + field.encode('utf-8') + b'":"'
+    for start in range(0, len(text), _STREAM_CHUNK):
+        # orjson escapes each slice; strip its surrounding quotes
+        yield orjson.dumps(text[start:start + _STREAM_CHUNK])[1:-1]
+    yield b'"}'
+
 class OriginalityAI:
     def __init__(self, api_key: str):
         self.api_key = api_key
@@ -14,22 +49,42 @@ class OriginalityAI:
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
+        # Persistent session: keep-alive avoids a fresh TCP+TLS handshake per call
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        ))
+        # Completed scans are immutable, so repeat lookups can skip the network
+        self._scan_cache = {}
 
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict:
         url = f"{self.base_url}/{endpoint}"
         try:
             if method.upper() == "POST":
-                payload = json.dumps(data) if data else None
-                response = requests.post(url, headers=self.headers, data=payload)
+                if data is None or isinstance(data, dict):
+                    payload = orjson.dumps(data) if data else None
+                else:
+                    payload = data  # pre-encoded bytes or a chunk generator
+                response = self._session.post(url, data=payload, timeout=(5, 60))
             else:
-                response = requests.get(url, headers=self.headers)
-            print(f"Response status: {response.status_code}")
-            print(f"Response text: {response.text}")
+                response = self._session.get(url, timeout=(5, 60))
+            logger.debug("Response status: %s", response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                # guarded: response.text decodes the whole body
+                logger.debug("Response text: %s", response.text)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.RequestException as e:
             return {"error": str(e)}
 
+    def close(self):
+        """Close the underlying HTTP session"""
+        self._session.close()
+
     def new_scan(self, text: str, scan_type: str = "all", title: str = None, excluded_url: str = None) -> Dict:
         """
         Create a new scan for text content
@@ -39,28 +94,32 @@ class OriginalityAI:
             title: Optional title for the scan
             excluded_url: Optional URL to exclude from plagiarism check
         """
-        data = {
-            "content": text,
+        ai_on, plag_on = _SCAN_FLAGS[scan_type]
+        meta = {
             "title": title or "Scan",
             "excludedUrl": excluded_url,
             "storeScan": True,
             "aiModel": "lite",
-            "scan_ai": True if scan_type in ['ai', 'all'] else False,
-            "scan_plag": True if scan_type in ['plagiarism', 'all'] else False,
+            "scan_ai": ai_on,
+            "scan_plag": plag_on,
             "scan_readability": True,
             "scan_grammar_spelling": True
         }
-        return self._make_request("POST", "scan", data)  # Changed endpoint to just 'scan'
+        if len(text) > _STREAM_THRESHOLD:
+            # chunked transfer keeps multi-MB documents out of one giant body
+            return self._make_request("POST", "scan", _iter_json_body(meta, "content", text))
+        return self._make_request("POST", "scan", dict(meta, content=text))  # Changed endpoint to just 'scan'
 
     def url_scan(self, url: str, scan_type: str = "all") -> Dict:
         """
         Scan content from a URL
         scan_type options: 'ai', 'plagiarism', 'all'
         """
+        ai_on, plag_on = _SCAN_FLAGS[scan_type]
         data = {
             "url": url,
-            "aidetect": True if scan_type in ['ai', 'all'] else False,
-            "plagiarism": True if scan_type in ['plagiarism', 'all'] else False
+            "aidetect": ai_on,
+            "plagiarism": plag_on
         }
         return self._make_request("POST", "scan/url", data)
 
@@ -72,15 +131,32 @@ class OriginalityAI:
         data = {"items": items}
         return self._make_request("POST", "scan/batch", data)
 
+    def new_scan_many(self, texts: list, scan_type: str = "all") -> Dict:
+        """
+        Scan several texts with one batch_scan POST instead of a
+        round-trip per document
+        """
+        items = [{"content": text, "type": scan_type} for text in texts]
+        return self.batch_scan(items)
+
     def get_scan(self, scan_id: str) -> Dict:
-        """Retrieve results for a specific scan"""
-        return self._make_request("GET", f"scan/{scan_id}")
+        """Retrieve results for a specific scan, cached per scan_id"""
+        if scan_id in self._scan_cache:
+            return self._scan_cache[scan_id]
+        result = self._make_request("GET", f"scan/{scan_id}")
+        if "error" not in result:
+            self._scan_cache[scan_id] = result
+        return result
+
+    def clear_scan_cache(self):
+        """Drop all locally cached get_scan results"""
+        self._scan_cache.clear()
 
     def get_scans(self, page: int = 1, limit: int = 10) -> Dict:
         """Retrieve multiple scans with pagination"""
         return self._make_request("GET", f"scans?page={page}&limit={limit}")
 
-    def save_results(self, result: Dict, filename: Optional[str] = None, save_raw: bool = True) -> tuple[str, Optional[str]]:
+    def save_results(self, result: Dict, filename: Optional[str] = None, save_raw: bool = True) -> tuple[str, Optional[str], str]:
         """
         Save scan results to file
         Args:
@@ -88,85 +164,182 @@ class OriginalityAI:
             filename: Optional custom filename
             save_raw: If True, saves raw JSON data alongside formatted results
         Returns:
-            Tuple of (formatted_path, raw_path) where raw_path is None if save_raw is False
+            Tuple of (formatted_path, raw_path, formatted_text) where raw_path is
+            None if save_raw is False; formatted_text lets callers print without
+            re-running format_results
         """
-        # create results directory if it does not exist
-        results_dir = "originality_results"
-        os.makedirs(results_dir, exist_ok=True)
+        # create results directory if it does not exist (once per process)
+        results_dir = RESULTS_DIR
+        if results_dir not in _dirs_ensured:
+            os.makedirs(results_dir, exist_ok=True)
+            _dirs_ensured.add(results_dir)
 
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"scan_result_{timestamp}"
 
+        formatted_text = format_results(result)
         formatted_path = os.path.join(results_dir, f"{filename}.txt")
-        with open(formatted_path, 'w', encoding='utf-8') as f:
-            f.write(format_results(result))
+        formatted_bytes = formatted_text.encode('utf-8')
 
         raw_path = None
         if save_raw:
             raw_path = os.path.join(results_dir, f"{filename}_raw.json")
-            with open(raw_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            raw_bytes = orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            # the two files are independent; overlap the disk writes
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                formatted_future = ex.submit(_write_bytes, formatted_path, formatted_bytes)
+                raw_future = ex.submit(_write_bytes, raw_path, raw_bytes)
+                # surface I/O errors (permissions, disk full) instead of
+                # returning paths to files that were never written
+                formatted_future.result()
+                raw_future.result()
+        else:
+            _write_bytes(formatted_path, formatted_bytes)
+
+        return formatted_path, raw_path, formatted_text
+
+class AsyncOriginalityAI:
+    """
+    Async variant of OriginalityAI for concurrent scan fan-out.
+    Requires the optional aiohttp dependency (pip install aiohttp).
+    Usage: results = asyncio.run(client.new_scan_many(texts))
+    """
+    def __init__(self, api_key: str):
+        import aiohttp  # optional dependency, only needed for the async client
+        self._aiohttp = aiohttp
+        self.api_key = api_key
+        self.base_url = "https://api.originality.ai/api/v2"
+        self.headers = {
+            "X-OAI-API-KEY": api_key,
+            "Accept": "application/json",
+            "Content-Type": "application/json"
+        }
+
+    def _session(self):
+        return self._aiohttp.ClientSession(
+            headers=self.headers,
+            connector=self._aiohttp.TCPConnector(limit=20)
+        )
+
+    async def _post(self, session, endpoint: str, data: Dict) -> Dict:
+        async with session.post(f"{self.base_url}/{endpoint}", data=orjson.dumps(data)) as resp:
+            resp.raise_for_status()
+            return orjson.loads(await resp.read())
 
-        return formatted_path, raw_path
+    async def _get(self, session, endpoint: str) -> Dict:
+        async with session.get(f"{self.base_url}/{endpoint}") as resp:
+            resp.raise_for_status()
+            return orjson.loads(await resp.read())
+
+    async def new_scan_many(self, texts: list, scan_type: str = "all") -> list:
+        """Submit one scan per text concurrently; failures come back as exceptions"""
+        ai_on, plag_on = _SCAN_FLAGS[scan_type]
+        payloads = [{
+            "content": text,
+            "title": "Scan",
+            "storeScan": True,
+            "aiModel": "lite",
+            "scan_ai": ai_on,
+            "scan_plag": plag_on,
+            "scan_readability": True,
+            "scan_grammar_spelling": True
+        } for text in texts]
+        async with self._session() as session:
+            return await asyncio.gather(
+                *[self._post(session, "scan", payload) for payload in payloads],
+                return_exceptions=True
+            )
+
+    async def get_scans_range(self, pages, limit: int = 10) -> list:
+        """Fetch several result pages concurrently instead of page-by-page"""
+        async with self._session() as session:
+            return await asyncio.gather(
+                *[self._get(session, f"scans?page={page}&limit={limit}") for page in pages],
+                return_exceptions=True
+            )
+
+def _fmt_ai(ai_data: Dict) -> list:
+    lines = []
+    _app = lines.append
+    if classification := ai_data.get("classification"):
+        _app("\nAI Detection Results:"
+             f"\nAI Probability: {classification.get('AI', 'N/A')}"
+             f"\nOriginal Probability: {classification.get('Original', 'N/A')}")
+    if confidence := ai_data.get("confidence"):
+        _app("\nConfidence Scores:"
+             f"\nAI Confidence: {confidence.get('AI', 'N/A'):.2%}"
+             f"\nOriginal Confidence: {confidence.get('Original', 'N/A'):.2%}")
+    return lines
+
+_MATCHES_HEADER = "\nPlagiarism Matches:"
+_MATCH_FMT = "- {url}: {score}% match"
+
+class _MatchDict(dict):
+    """Match dict whose missing keys format as N/A"""
+    def __missing__(self, key):
+        return 'N/A'
+
+def _fmt_plagiarism(plag_data: Dict) -> list:
+    lines = []
+    _app = lines.append
+    _app("\nPlagiarism Results:")
+    if (score := plag_data.get("score")) is not None:
+        _app(f"Plagiarism Score: {score}%")
+    if matches := plag_data.get("matches"):
+        _app(_MATCHES_HEADER)
+        _app("\n".join(_MATCH_FMT.format_map(_MatchDict(m)) for m in matches))
+    return lines
+
+def _fmt_readability(read_data: Dict) -> list:
+    lines = []
+    _app = lines.append
+    _app("\nReadability Metrics:")
+    if stats := read_data.get("textStats"):
+        _app(f"Word Count: {stats.get('uniqueWordCount', 'N/A')}"
+             f"\nSentence Count: {stats.get('sentenceCount', 'N/A')}"
+             f"\nAverage Speaking Time: {stats.get('averageSpeakingTime', 'N/A')} minutes"
+             f"\nAverage Reading Time: {stats.get('averageReadingTime', 'N/A')} minutes")
+    if scores := read_data.get("readability"):
+        _app("\nReadability Scores:"
+             f"\nFlesch Reading Ease: {scores.get('fleschReadingEase', 'N/A')}"
+             f"\nFlesch-Kincaid Grade Level: {scores.get('fleschGradeLevel', 'N/A')}")
+    return lines
+
+def _fmt_grammar_spelling(gs_data: Dict) -> list:
+    if error := gs_data.get("error"):
+        return [f"\nGrammar & Spelling: {error}"]
+    return []
+
+def _fmt_credits(credits: Dict) -> list:
+    return [
+        "\nCredits Information:",
+        f"Used Credits: {credits.get('used', 'N/A')}",
+        f"Base Credits: {credits.get('base_credits', 'N/A')}",
+        f"Subscription Credits: {credits.get('subscription_credits', 'N/A')}",
+    ]
+
+# Fixed result schema: one (key, formatter) pair per section, walked in order
+_SECTIONS = [
+    ("ai", _fmt_ai),
+    ("plagiarism", _fmt_plagiarism),
+    ("readability", _fmt_readability),
+    ("grammarSpelling", _fmt_grammar_spelling),
+    ("credits", _fmt_credits),
+]
 
 def format_results(result: Dict) -> str:
     """Format scan results for display"""
-    output = []
-    
     if "error" in result:
         return f"Error: {result['error']}"
-    
-    if "ai" in result and result["ai"]:
-        ai_data = result["ai"]
-        if "classification" in ai_data:
-            output.append("\nAI Detection Results:")
-            output.append(f"AI Probability: {ai_data['classification'].get('AI', 'N/A')}")
-            output.append(f"Original Probability: {ai_data['classification'].get('Original', 'N/A')}")
-        
-        if "confidence" in ai_data:
-            output.append("\nConfidence Scores:")
-            output.append(f"AI Confidence: {ai_data['confidence'].get('AI', 'N/A'):.2%}")
-            output.append(f"Original Confidence: {ai_data['confidence'].get('Original', 'N/A'):.2%}")
-    
-    if "plagiarism" in result and result["plagiarism"]:
-        plag_data = result["plagiarism"]
-        output.append("\nPlagiarism Results:")
-        if "score" in plag_data:
-            output.append(f"Plagiarism Score: {plag_data['score']}%")
-        
-        if "matches" in plag_data and plag_data["matches"]:
-            output.append("\nPlagiarism Matches:")
-            for match in plag_data["matches"]:
-                output.append(f"- {match.get('url', 'N/A')}: {match.get('score', 'N/A')}% match")
-    
-    if "readability" in result and result["readability"]:
-        read_data = result["readability"]
-        output.append("\nReadability Metrics:")
-        if "textStats" in read_data:
-            stats = read_data["textStats"]
-            output.append(f"Word Count: {stats.get('uniqueWordCount', 'N/A')}")
-            output.append(f"Sentence Count: {stats.get('sentenceCount', 'N/A')}")
-            output.append(f"Average Speaking Time: {stats.get('averageSpeakingTime', 'N/A')} minutes")
-            output.append(f"Average Reading Time: {stats.get('averageReadingTime', 'N/A')} minutes")
-        
-        if "readability" in read_data:
-            scores = read_data["readability"]
-            output.append("\nReadability Scores:")
-            output.append(f"Flesch Reading Ease: {scores.get('fleschReadingEase', 'N/A')}")
-            output.append(f"Flesch-Kincaid Grade Level: {scores.get('fleschGradeLevel', 'N/A')}")
-    
-    if "grammarSpelling" in result and result["grammarSpelling"]:
-        if "error" in result["grammarSpelling"]:
-            output.append(f"\nGrammar & Spelling: {result['grammarSpelling']['error']}")
-    
-    if "credits" in result and result["credits"]:
-        credits = result["credits"]
-        output.append("\nCredits Information:")
-        output.append(f"Used Credits: {credits.get('used', 'N/A')}")
-        output.append(f"Base Credits: {credits.get('base_credits', 'N/A')}")
-        output.append(f"Subscription Credits: {credits.get('subscription_credits', 'N/A')}")
-    
+
+    output = []
+    _extend = output.extend
+    for key, fmt in _SECTIONS:
+        data = result.get(key)
+        if data:
+            _extend(fmt(data))
+
     return "\n".join(output) if output else "No results available"
 
 def initialize_client():
@@ -178,25 +351,39 @@ if __name__ == "__main__":
     try:
         client = initialize_client()
         
-        input_file = "input.txt"  # change this to desired input file path
-        try:
-            with open(input_file, 'r', encoding='utf-8') as file:
-                text = file.read()
-                if not text.strip():
+        input_file = "input.txt"  # a single file, or a directory of .txt files
+        if os.path.isdir(input_file):
+            # submit the whole directory as one batch instead of a scan per file
+            texts = []
+            for path in sorted(glob.glob(os.path.join(input_file, "*.txt"))):
+                with open(path, 'rb') as file:
+                    raw = file.read()
+                if raw.strip():
+                    texts.append(raw.decode('utf-8'))
+            if not texts:
+                raise ValueError(f"No non-empty .txt files found in '{input_file}'")
+            result = client.new_scan_many(texts)
+        else:
+            try:
+                # read once as bytes; decode a single time before the scan
+                with open(input_file, 'rb') as file:
+                    raw = file.read()
+                if not raw.strip():
                     raise ValueError("Input file is empty")
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Input file '{input_file}' not found")
-        
-        # prerform the scan
-        result = client.new_scan(text)
+                text = raw.decode('utf-8')
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Input file '{input_file}' not found")
+
+            # prerform the scan
+            result = client.new_scan(text)
         
         # save results
-        formatted_file, raw_file = client.save_results(result, save_raw=True)
+        formatted_file, raw_file, formatted_text = client.save_results(result, save_raw=True)
         print(f"Formatted results saved to: {formatted_file}")
         if raw_file:
             print(f"Raw JSON saved to: {raw_file}")
         print("\nScan Results:")
-        print(format_results(result))
+        print(formatted_text)
         
     except Exception as e:
         print(f"Error: {str(e)}")
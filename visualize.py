@@ -1,469 +1,568 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import json
-from pathlib import Path
-import plotly.express as px
+import orjson
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 import plotly.graph_objects as go
-from typing import Dict, List, Optional
+from typing import Dict, List
 import numpy as np
-import base64
 from jinja2 import Template
-import io
-from streamlit.components.v1 import html
-from script import OriginalityAI, initialize_client, format_results
-import tempfile
+from script import OriginalityAI, initialize_client
 
 
+def _data_fingerprint(data: Dict) -> str:
+    """Stable hash of a result payload, used to key the cached figure builders"""
+    return hashlib.blake2b(
+        orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+@st.cache_data(show_spinner=False)
+def _plot_ai_detection(data_key: str, _data: Dict) -> go.Figure:
+    """Create an interactive pie chart for AI detection results"""
+    if not _data.get('ai'):
+        return None
+
+    ai_data = _data['ai']
+    labels = ['AI Generated', 'Original']
+    # float32 arrays serialize via Plotly's compact base64 typed-array path
+    values = np.array([
+        ai_data['confidence'].get('AI', 0) * 100,
+        ai_data['confidence'].get('Original', 0) * 100
+    ], dtype=np.float32)
+
+    # All traces carry _validate=False: the data is produced internally, so
+    # Plotly's per-property schema walk is skipped at construction time
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=.3,
+        marker_colors=['#FF9999', '#66B2FF'],
+        _validate=False
+    )])
+
+    fig.update_layout(
+        title="AI Detection Confidence Scores",
+        annotations=[dict(text='AI Analysis', x=0.5, y=0.5, font_size=20, showarrow=False)]
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _plot_readability_metrics(data_key: str, _data: Dict) -> go.Figure:
+    """Create a radar chart for readability metrics"""
+    if not _data.get('readability'):
+        return None
+
+    metrics = _data['readability']['readability']
+
+    categories = ['Flesch Reading Ease', 'Flesch-Kincaid Grade',
+                  'Gunning Fox Index', 'SMOG Index', 'Coleman-Liau']
+    values = [
+        metrics.get('fleschReadingEase', 0),
+        metrics.get('fleschGradeLevel', 0),
+        metrics.get('gunningFoxIndex', 0),
+        metrics.get('smogIndex', 0),
+        metrics.get('colemanLiauIndex', 0)
+    ]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=values,
+        theta=categories,
+        fill='toself',
+        name='Readability Scores',
+        _validate=False
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, max(values) * 1.2]
+            )),
+        showlegend=False,
+        title="Readability Metrics"
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _plot_text_statistics(data_key: str, _data: Dict) -> go.Figure:
+    """Create a bar chart for text statistics"""
+    if not _data.get('readability'):
+        return None
+
+    stats = _data['readability']['textStats']
+
+    metrics = {
+        'Word Count': stats.get('uniqueWordCount', 0),
+        'Sentence Count': stats.get('sentenceCount', 0),
+        'Syllable Count': stats.get('syllableCount', 0),
+        'Speaking Time (min)': stats.get('averageSpeakingTime', 0),
+        'Reading Time (min)': stats.get('averageReadingTime', 0)
+    }
+
+    fig = go.Figure([go.Bar(
+        x=list(metrics.keys()),
+        y=np.fromiter(metrics.values(), dtype=np.float32, count=len(metrics)),
+        marker_color=['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC'],
+        _validate=False
+    )])
+
+    fig.update_layout(
+        title="Text Statistics",
+        xaxis_title="Metric",
+        yaxis_title="Value"
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _blocks_frame(data_key: str, _data: Dict) -> pd.DataFrame:
+    """Flatten ai.blocks into native columns (result_fake/result_real) once"""
+    blocks = _data.get('ai', {}).get('blocks')
+    if not blocks:
+        return pd.DataFrame()
+    return pd.json_normalize(blocks, sep='_')
+
+@st.cache_data(show_spinner=False)
+def _sentences_frame(data_key: str, _data: Dict) -> pd.DataFrame:
+    """Materialize readability.sentences as one DataFrame for columnar stats"""
+    sentences = _data.get('readability', {}).get('sentences')
+    if not sentences:
+        return pd.DataFrame()
+    return pd.DataFrame(sentences)
+
+def _bool_count(sent: pd.DataFrame, col: str) -> int:
+    if col not in sent:
+        return 0
+    return int(sent[col].fillna(False).sum())
+
+def _nonempty_count(sent: pd.DataFrame, col: str) -> int:
+    if col not in sent:
+        return 0
+    return int(sent[col].str.len().gt(0).sum())
+
+def _sentence_complexity(data_key: str, data: Dict) -> Dict:
+    """Analyze sentence complexity and return insights"""
+    if not data.get('readability'):
+        return {}
+
+    sent = _sentences_frame(data_key, data)
+
+    analysis = {
+        'total_sentences': len(sent),
+        'hard_sentences': _bool_count(sent, 'isHard'),
+        'very_hard_sentences': _bool_count(sent, 'isVeryHard'),
+        'sentences_with_long_words': _nonempty_count(sent, 'wordsOver13Chars'),
+        'sentences_with_complex_words': _nonempty_count(sent, 'wordsOver4Syllables')
+    }
+
+    return analysis
+
+@st.cache_data(show_spinner=False)
+def _plot_sentence_complexity(data_key: str, _data: Dict) -> go.Figure:
+    """Create a visualization of sentence complexity"""
+    analysis = _sentence_complexity(data_key, _data)
+    if not analysis:
+        return None
+
+    labels = ['Simple', 'Hard', 'Very Hard']
+    values = [
+        analysis['total_sentences'] - analysis['hard_sentences'] - analysis['very_hard_sentences'],
+        analysis['hard_sentences'],
+        analysis['very_hard_sentences']
+    ]
+
+    fig = go.Figure([go.Bar(
+        x=labels,
+        y=values,
+        marker_color=['#99FF99', '#FFCC99', '#FF9999'],
+        _validate=False
+    )])
+
+    fig.update_layout(
+        title="Sentence Complexity Distribution",
+        xaxis_title="Complexity Level",
+        yaxis_title="Number of Sentences"
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _ai_blocks_table(data_key: str, _data: Dict) -> pd.DataFrame:
+    """Analyze AI detection results for individual text blocks"""
+    if not _data.get('ai') or not _data['ai'].get('blocks'):
+        return pd.DataFrame()
+
+    flat = _blocks_frame(data_key, _data)
+    # float32 scores halve the Arrow payload st.dataframe ships to the browser
+    return flat[['text']].assign(
+        ai_score=flat['result_fake'].fillna(0).mul(100).astype(np.float32),
+        human_score=flat['result_real'].fillna(0).mul(100).astype(np.float32)
+    )
+
+@st.cache_data(show_spinner=False)
+def _plot_plagiarism_metrics(data_key: str, _data: Dict) -> go.Figure:
+    """Create visualization for plagiarism metrics"""
+    if not _data.get('plagiarism'):
+        return None
+
+    plag_data = _data['plagiarism']
+
+    # Create metrics for plagiarism
+    metrics = {
+        'Overall Score': plag_data.get('score', 0),
+    }
+
+    # Add match scores if available
+    if plag_data.get('matches'):
+        for i, match in enumerate(plag_data['matches'], 1):
+            metrics[f'Match {i}'] = match.get('score', 0)
+
+    fig = go.Figure([go.Bar(
+        x=list(metrics.keys()),
+        y=np.fromiter(metrics.values(), dtype=np.float32, count=len(metrics)),
+        marker_color='#FF9999',
+        text=[f'{v}%' for v in metrics.values()],
+        textposition='auto',
+        _validate=False
+    )])
+
+    fig.update_layout(
+        title="Plagiarism Analysis",
+        xaxis_title="Source",
+        yaxis_title="Match Percentage (%)",
+        yaxis_range=[0, 100]
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _plot_readability_details(data_key: str, _data: Dict) -> go.Figure:
+    """Create detailed readability visualization"""
+    if not _data.get('readability'):
+        return None
+
+    read_data = _data['readability']
+    text_stats = read_data['textStats']
+
+    # Create detailed metrics
+    metrics = {
+        'Unique Words': text_stats.get('uniqueWordCount', 0),
+        'Total Syllables': text_stats.get('totalSyllables', 0),
+        'Avg Syllables/Word': text_stats.get('averageSyllablesPerWord', 0),
+        'Words with 3+ Syllables': text_stats.get('wordsWithThreeSyllables', 0),
+        '% Complex Words': text_stats.get('percentWordsWithThreeSyllables', 0)
+    }
+
+    fig = go.Figure([go.Bar(
+        x=list(metrics.keys()),
+        y=np.fromiter(metrics.values(), dtype=np.float32, count=len(metrics)),
+        marker_color=['#66B2FF', '#99FF99', '#FFCC99', '#FF99CC', '#FF9999'],
+        text=[f'{v:.1f}' if isinstance(v, float) else v for v in metrics.values()],
+        textposition='auto',
+        _validate=False
+    )])
+
+    fig.update_layout(
+        title="Detailed Readability Metrics",
+        xaxis_title="Metric",
+        yaxis_title="Value"
+    )
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _plot_sentence_heatmap(data_key: str, _data: Dict) -> go.Figure:
+    """Create a heatmap of sentence complexity and AI probability"""
+    if not _data.get('ai') or not _data['ai'].get('blocks'):
+        return None
+
+    blocks = _data['ai']['blocks']
+
+    # Two flat arrays straight from the block dicts; the heatmap only needs
+    # length and AI probability, so skip the DataFrame entirely
+    lengths = np.fromiter((len(b['text']) for b in blocks), dtype=np.float32, count=len(blocks))
+    probs = np.fromiter((b['result'].get('fake', 0) for b in blocks), dtype=np.float32, count=len(blocks))
+    heatmap_data = np.stack([lengths, probs * 100], axis=0)
+
+    fig = go.Figure(data=go.Heatmap(
+        z=heatmap_data,
+        x=np.arange(len(blocks)),
+        y=['Length', 'AI Probability'],
+        colorscale='RdBu_r',
+        showscale=True,
+        _validate=False
+    ))
+
+    fig.update_layout(
+        title="Sentence Analysis Heatmap",
+        xaxis_title="Sentence Index",
+        yaxis_title="Metrics"
+    )
+    return fig
+
+def _rolling_mean_edge(x: np.ndarray, w: int) -> np.ndarray:
+    """Fixed-window moving average with min_periods=1 behavior at the left edge"""
+    cs = np.concatenate(([0.0], np.cumsum(x, dtype=np.float64)))
+    i = np.arange(1, len(x) + 1)
+    lo = np.maximum(i - w, 0)
+    return ((cs[i] - cs[lo]) / np.minimum(i, w)).astype(np.float32)
+
+@st.cache_data(show_spinner=False)
+def _plot_readability_timeline(data_key: str, _data: Dict) -> go.Figure:
+    """Create a timeline view of readability metrics across the text"""
+    if not _data.get('readability') or not _data['readability'].get('sentences'):
+        return None
+
+    sent = _sentences_frame(data_key, _data)
+    window_size = 5
+
+    signals = {
+        'Complexity': sent['isHard'].to_numpy(np.uint8) + sent['isVeryHard'].to_numpy(np.uint8),
+        'Long Words': sent['wordsOver13Chars'].str.len().to_numpy(np.float64),
+        'Complex Words': sent['wordsOver4Syllables'].str.len().to_numpy(np.float64)
+    }
+
+    fig = go.Figure()
+
+    x = np.arange(len(sent))
+    for name, values in signals.items():
+        fig.add_trace(go.Scatter(
+            x=x,
+            y=_rolling_mean_edge(values, window_size),
+            name=name,
+            mode='lines+markers',
+            _validate=False
+        ))
+
+    fig.update_layout(
+        title=f"Readability Timeline (Rolling Average: {window_size} sentences)",
+        xaxis_title="Sentence Position",
+        yaxis_title="Metric Value",
+        showlegend=True
+    )
+    return fig
+
 class OriginalityVisualizer:
+    """Thin facade over the cached figure builders, keyed by a data fingerprint"""
+
     def __init__(self, json_data: Dict):
         """Initialize visualizer with JSON data"""
         self.data = json_data
-        
+        self._data_key = _data_fingerprint(json_data)
+
     def plot_ai_detection_results(self) -> go.Figure:
         """Create an interactive pie chart for AI detection results"""
-        if not self.data.get('ai'):
-            return None
-            
-        ai_data = self.data['ai']
-        labels = ['AI Generated', 'Original']
-        values = [
-            ai_data['confidence'].get('AI', 0) * 100,
-            ai_data['confidence'].get('Original', 0) * 100
-        ]
-        
-        fig = go.Figure(data=[go.Pie(
-            labels=labels,
-            values=values,
-            hole=.3,
-            marker_colors=['#FF9999', '#66B2FF']
-        )])
-        
-        fig.update_layout(
-            title="AI Detection Confidence Scores",
-            annotations=[dict(text='AI Analysis', x=0.5, y=0.5, font_size=20, showarrow=False)]
-        )
-        return fig
-    
+        return _plot_ai_detection(self._data_key, self.data)
+
     def plot_readability_metrics(self) -> go.Figure:
         """Create a radar chart for readability metrics"""
-        if not self.data.get('readability'):
-            return None
-            
-        metrics = self.data['readability']['readability']
-        
-        categories = ['Flesch Reading Ease', 'Flesch-Kincaid Grade', 
-                     'Gunning Fox Index', 'SMOG Index', 'Coleman-Liau']
-        values = [
-            metrics.get('fleschReadingEase', 0),
-            metrics.get('fleschGradeLevel', 0),
-            metrics.get('gunningFoxIndex', 0),
-            metrics.get('smogIndex', 0),
-            metrics.get('colemanLiauIndex', 0)
-        ]
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatterpolar(
-            r=values,
-            theta=categories,
-            fill='toself',
-            name='Readability Scores'
-        ))
-        
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, max(values) * 1.2]
-                )),
-            showlegend=False,
-            title="Readability Metrics"
-        )
-        return fig
-    
+        return _plot_readability_metrics(self._data_key, self.data)
+
     def plot_text_statistics(self) -> go.Figure:
         """Create a bar chart for text statistics"""
-        if not self.data.get('readability'):
-            return None
-            
-        stats = self.data['readability']['textStats']
-        
-        metrics = {
-            'Word Count': stats.get('uniqueWordCount', 0),
-            'Sentence Count': stats.get('sentenceCount', 0),
-            'Syllable Count': stats.get('syllableCount', 0),
-            'Speaking Time (min)': stats.get('averageSpeakingTime', 0),
-            'Reading Time (min)': stats.get('averageReadingTime', 0)
-        }
-        
-        fig = go.Figure([go.Bar(
-            x=list(metrics.keys()),
-            y=list(metrics.values()),
-            marker_color=['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC']
-        )])
-        
-        fig.update_layout(
-            title="Text Statistics",
-            xaxis_title="Metric",
-            yaxis_title="Value"
-        )
-        return fig
-    
+        return _plot_text_statistics(self._data_key, self.data)
+
     def plot_sentence_complexity(self) -> go.Figure:
         """Create a visualization of sentence complexity"""
-        analysis = self.analyze_sentence_complexity()
-        if not analysis:
-            return None
-            
-        labels = ['Simple', 'Hard', 'Very Hard']
-        values = [
-            analysis['total_sentences'] - analysis['hard_sentences'] - analysis['very_hard_sentences'],
-            analysis['hard_sentences'],
-            analysis['very_hard_sentences']
-        ]
-        
-        fig = go.Figure([go.Bar(
-            x=labels,
-            y=values,
-            marker_color=['#99FF99', '#FFCC99', '#FF9999']
-        )])
-        
-        fig.update_layout(
-            title="Sentence Complexity Distribution",
-            xaxis_title="Complexity Level",
-            yaxis_title="Number of Sentences"
-        )
-        return fig
+        return _plot_sentence_complexity(self._data_key, self.data)
+
+    @cached_property
+    def complexity(self) -> Dict:
+        """Sentence complexity counts, computed once per instance"""
+        return _sentence_complexity(self._data_key, self.data)
 
     def analyze_sentence_complexity(self) -> Dict:
         """Analyze sentence complexity and return insights"""
-        if not self.data.get('readability'):
-            return {}
-            
-        sentences = self.data['readability'].get('sentences', [])
-        
-        analysis = {
-            'total_sentences': len(sentences),
-            'hard_sentences': sum(1 for s in sentences if s.get('isHard', False)),
-            'very_hard_sentences': sum(1 for s in sentences if s.get('isVeryHard', False)),
-            'sentences_with_long_words': sum(1 for s in sentences if s.get('wordsOver13Chars', [])),
-            'sentences_with_complex_words': sum(1 for s in sentences if s.get('wordsOver4Syllables', []))
-        }
-        
-        return analysis
-    
+        return self.complexity
+
     def analyze_ai_blocks(self) -> pd.DataFrame:
         """Analyze AI detection results for individual text blocks"""
-        if not self.data.get('ai') or not self.data['ai'].get('blocks'):
-            return pd.DataFrame()
-        
-        blocks = self.data['ai']['blocks']
-        df = pd.DataFrame(blocks)
-        df['ai_score'] = df['result'].apply(lambda x: x.get('fake', 0) * 100)
-        df['human_score'] = df['result'].apply(lambda x: x.get('real', 0) * 100)
-        return df[['text', 'ai_score', 'human_score']]
+        return _ai_blocks_table(self._data_key, self.data)
 
     def plot_plagiarism_metrics(self) -> go.Figure:
         """Create visualization for plagiarism metrics"""
-        if not self.data.get('plagiarism'):
-            return None
-            
-        plag_data = self.data['plagiarism']
-        
-        # Create metrics for plagiarism
-        metrics = {
-            'Overall Score': plag_data.get('score', 0),
-        }
-        
-        # Add match scores if available
-        if plag_data.get('matches'):
-            for i, match in enumerate(plag_data['matches'], 1):
-                metrics[f'Match {i}'] = match.get('score', 0)
-        
-        fig = go.Figure([go.Bar(
-            x=list(metrics.keys()),
-            y=list(metrics.values()),
-            marker_color='#FF9999',
-            text=[f'{v}%' for v in metrics.values()],
-            textposition='auto',
-        )])
-        
-        fig.update_layout(
-            title="Plagiarism Analysis",
-            xaxis_title="Source",
-            yaxis_title="Match Percentage (%)",
-            yaxis_range=[0, 100]
-        )
-        return fig
+        return _plot_plagiarism_metrics(self._data_key, self.data)
 
     def plot_readability_details(self) -> go.Figure:
         """Create detailed readability visualization"""
-        if not self.data.get('readability'):
-            return None
-            
-        read_data = self.data['readability']
-        text_stats = read_data['textStats']
-        
-        # Create detailed metrics
-        metrics = {
-            'Unique Words': text_stats.get('uniqueWordCount', 0),
-            'Total Syllables': text_stats.get('totalSyllables', 0),
-            'Avg Syllables/Word': text_stats.get('averageSyllablesPerWord', 0),
-            'Words with 3+ Syllables': text_stats.get('wordsWithThreeSyllables', 0),
-            '% Complex Words': text_stats.get('percentWordsWithThreeSyllables', 0)
-        }
-        
-        fig = go.Figure([go.Bar(
-            x=list(metrics.keys()),
-            y=list(metrics.values()),
-            marker_color=['#66B2FF', '#99FF99', '#FFCC99', '#FF99CC', '#FF9999'],
-            text=[f'{v:.1f}' if isinstance(v, float) else v for v in metrics.values()],
-            textposition='auto',
-        )])
-        
-        fig.update_layout(
-            title="Detailed Readability Metrics",
-            xaxis_title="Metric",
-            yaxis_title="Value"
-        )
-        return fig
+        return _plot_readability_details(self._data_key, self.data)
 
     def plot_sentence_heatmap(self) -> go.Figure:
         """Create a heatmap of sentence complexity and AI probability"""
-        if not self.data.get('ai') or not self.data['ai'].get('blocks'):
-            return None
-        
-        blocks = self.data['ai']['blocks']
-        df = pd.DataFrame(blocks)
-        
-        # Calculate metrics for each block
-        df['length'] = df['text'].str.len()
-        df['ai_prob'] = df['result'].apply(lambda x: x.get('fake', 0))
-        
-        # Create heatmap data
-        heatmap_data = np.column_stack((
-            df['length'].values,
-            df['ai_prob'].values * 100
-        ))
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=heatmap_data.T,
-            x=np.arange(len(df)),
-            y=['Length', 'AI Probability'],
-            colorscale='RdBu_r',
-            showscale=True
-        ))
-        
-        fig.update_layout(
-            title="Sentence Analysis Heatmap",
-            xaxis_title="Sentence Index",
-            yaxis_title="Metrics"
-        )
-        return fig
+        return _plot_sentence_heatmap(self._data_key, self.data)
 
     def plot_readability_timeline(self) -> go.Figure:
         """Create a timeline view of readability metrics across the text"""
-        if not self.data.get('readability') or not self.data['readability'].get('sentences'):
-            return None
-        
-        sentences = self.data['readability']['sentences']
-        df = pd.DataFrame(sentences)
-        
-        # Calculate rolling averages
-        window_size = 5
-        metrics = {
-            'Complexity': df['isHard'].astype(int) + df['isVeryHard'].astype(int),
-            'Long Words': df['wordsOver13Chars'].str.len(),
-            'Complex Words': df['wordsOver4Syllables'].str.len()
-        }
-        
-        fig = go.Figure()
-        
-        for name, values in metrics.items():
-            rolling_avg = values.rolling(window=window_size, min_periods=1).mean()
-            fig.add_trace(go.Scatter(
-                x=np.arange(len(rolling_avg)),
-                y=rolling_avg,
-                name=name,
-                mode='lines+markers'
-            ))
-        
-        fig.update_layout(
-            title=f"Readability Timeline (Rolling Average: {window_size} sentences)",
-            xaxis_title="Sentence Position",
-            yaxis_title="Metric Value",
-            showlegend=True
-        )
-        return fig
+        return _plot_readability_timeline(self._data_key, self.data)
 
     def generate_detailed_insights(self) -> List[str]:
-        """Generate detailed insights from all analyses"""
+        """Generate detailed insights from all analyses, one string per section"""
         insights = []
-        
+
         # AI Detection Insights
-        if self.data.get('ai'):
-            ai_conf = self.data['ai']['confidence']
-            ai_prob = ai_conf.get('AI', 0) * 100
-            insights.append(f"🤖 AI Detection:")
-            insights.append(f"  - Overall AI Probability: {ai_prob:.1f}%")
-            
-            blocks = self.data['ai'].get('blocks', [])
-            if blocks:
-                high_ai_blocks = sum(1 for b in blocks if b['result'].get('fake', 0) > 0.75)
-                insights.append(f"  - {high_ai_blocks} text blocks show strong AI characteristics")
-        
+        if ai_data := self.data.get('ai'):
+            ai_prob = ai_data['confidence'].get('AI', 0) * 100
+            section = ("🤖 AI Detection:"
+                       f"\n  - Overall AI Probability: {ai_prob:.1f}%")
+            blocks = _blocks_frame(self._data_key, self.data)
+            if 'result_fake' in blocks:
+                high_ai_blocks = int((blocks['result_fake'] > 0.75).sum())
+                section += f"\n  - {high_ai_blocks} text blocks show strong AI characteristics"
+            insights.append(section)
+
         # Readability Insights
-        if self.data.get('readability'):
-            metrics = self.data['readability']['readability']
-            stats = self.data['readability']['textStats']
-            
-            insights.append("\n📚 Readability Analysis:")
-            insights.append(f"  - Flesch Reading Ease: {metrics.get('fleschReadingEase', 0):.1f}")
-            insights.append(f"  - Average Reading Time: {stats.get('averageReadingTime', 0):.1f} minutes")
-            
-            complexity = self.analyze_sentence_complexity()
-            if complexity:
+        if read_data := self.data.get('readability'):
+            metrics = read_data['readability']
+            stats = read_data['textStats']
+            section = ("\n📚 Readability Analysis:"
+                       f"\n  - Flesch Reading Ease: {metrics.get('fleschReadingEase', 0):.1f}"
+                       f"\n  - Average Reading Time: {stats.get('averageReadingTime', 0):.1f} minutes")
+
+            complexity = self.complexity
+            if complexity and complexity['total_sentences'] > 0:
                 total = complexity['total_sentences']
-                hard = complexity['hard_sentences']
-                very_hard = complexity['very_hard_sentences']
-                if total > 0:
-                    hard_percent = (hard + very_hard) / total * 100
-                    insights.append(f"  - {hard_percent:.1f}% of sentences are complex")
-        
+                hard = complexity['hard_sentences'] + complexity['very_hard_sentences']
+                section += f"\n  - {hard / total * 100:.1f}% of sentences are complex"
+            insights.append(section)
+
         # Plagiarism Insights
-        if self.data.get('plagiarism'):
-            plag_data = self.data['plagiarism']
-            insights.append("\n🔍 Plagiarism Check:")
-            insights.append(f"  - Overall Score: {plag_data.get('score', 0)}%")
-            
+        if plag_data := self.data.get('plagiarism'):
+            section = ("\n🔍 Plagiarism Check:"
+                       f"\n  - Overall Score: {plag_data.get('score', 0)}%")
             if plag_data.get('matches'):
-                insights.append(f"  - Found {len(plag_data['matches'])} potential matches")
-        
+                section += f"\n  - Found {len(plag_data['matches'])} potential matches"
+            insights.append(section)
+
         return insights
 
-def export_to_html(figs: List[go.Figure], insights: List[str], data: Dict) -> str:
-    """Convert dashboard to HTML with enhanced styling"""
-    html_template = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Originality.AI Analysis Report</title>
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        <style>
-            body { 
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                margin: 0;
-                padding: 20px;
-                background-color: #f5f5f5;
-            }
-            .container { 
-                max-width: 1200px;
-                margin: auto;
-                background-color: white;
-                padding: 20px;
-                border-radius: 10px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }
-            .section { 
-                margin: 30px 0;
-                padding: 20px;
-                border: 1px solid #eee;
-                border-radius: 8px;
-                background-color: white;
-            }
-            .section h2 {
-                color: #2c3e50;
-                border-bottom: 2px solid #3498db;
-                padding-bottom: 10px;
-            }
-            .insights { 
-                background-color: #f8f9fa;
-                padding: 20px;
-                border-radius: 8px;
-                font-family: monospace;
-                white-space: pre-wrap;
-            }
-            .metric { 
-                display: inline-block;
-                margin: 10px;
-                padding: 15px 25px;
-                background-color: #fff;
-                border-radius: 8px;
-                box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-                transition: transform 0.2s;
-            }
-            .metric:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 4px 8px rgba(0,0,0,0.15);
-            }
-            .plot-container {
-                margin: 20px 0;
-                padding: 10px;
-                background-color: white;
-                border-radius: 8px;
-                box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1 style="color: #2c3e50; text-align: center;">Originality.AI Analysis Report</h1>
-            
-            <div class="section">
-                <h2>Document Properties</h2>
-                {% if properties %}
-                    <div class="metric">Title: {{ properties.title }}</div>
-                    <div class="metric">ID: {{ properties.id }}</div>
-                    <div class="metric">Public Link: <a href="{{ properties.public_link }}" target="_blank">View</a></div>
-                {% endif %}
+
+_REPORT_TEMPLATE_SRC = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Originality.AI Analysis Report</title>
+    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <style>
+        body { 
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            margin: 0;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container { 
+            max-width: 1200px;
+            margin: auto;
+            background-color: white;
+            padding: 20px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        .section { 
+            margin: 30px 0;
+            padding: 20px;
+            border: 1px solid #eee;
+            border-radius: 8px;
+            background-color: white;
+        }
+        .section h2 {
+            color: #2c3e50;
+            border-bottom: 2px solid #3498db;
+            padding-bottom: 10px;
+        }
+        .insights { 
+            background-color: #f8f9fa;
+            padding: 20px;
+            border-radius: 8px;
+            font-family: monospace;
+            white-space: pre-wrap;
+        }
+        .metric { 
+            display: inline-block;
+            margin: 10px;
+            padding: 15px 25px;
+            background-color: #fff;
+            border-radius: 8px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+            transition: transform 0.2s;
+        }
+        .metric:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 4px 8px rgba(0,0,0,0.15);
+        }
+        .plot-container {
+            margin: 20px 0;
+            padding: 10px;
+            background-color: white;
+            border-radius: 8px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.05);
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1 style="color: #2c3e50; text-align: center;">Originality.AI Analysis Report</h1>
+        
+        <div class="section">
+            <h2>Document Properties</h2>
+            {% if properties %}
+                <div class="metric">Title: {{ properties.title }}</div>
+                <div class="metric">ID: {{ properties.id }}</div>
+                <div class="metric">Public Link: <a href="{{ properties.public_link }}" target="_blank">View</a></div>
+            {% endif %}
+        </div>
+        
+        <div class="section">
+            <h2>Key Insights</h2>
+            <div class="insights">
+                {% for insight in insights %}
+                    {{ insight }}
+                {% endfor %}
             </div>
-            
+        </div>
+        
+        {% for plot in plots %}
             <div class="section">
-                <h2>Key Insights</h2>
-                <div class="insights">
-                    {% for insight in insights %}
-                        {{ insight }}
-                    {% endfor %}
+                <div class="plot-container">
+                    {{ plot }}
                 </div>
             </div>
-            
-            {% for plot in plots %}
-                <div class="section">
-                    <div class="plot-container">
-                        {{ plot }}
-                    </div>
-                </div>
-            {% endfor %}
-            
-            <div class="section">
-                <h2>Credits Information</h2>
-                {% if credits %}
-                    <div class="metric">Used Credits: {{ credits.used }}</div>
-                    <div class="metric">Base Credits: {{ credits.base_credits }}</div>
-                    <div class="metric">Subscription Credits: {{ credits.subscription_credits }}</div>
-                {% endif %}
-            </div>
+        {% endfor %}
+        
+        <div class="section">
+            <h2>Credits Information</h2>
+            {% if credits %}
+                <div class="metric">Used Credits: {{ credits.used }}</div>
+                <div class="metric">Base Credits: {{ credits.base_credits }}</div>
+                <div class="metric">Subscription Credits: {{ credits.subscription_credits }}</div>
+            {% endif %}
         </div>
-        <script>
-            // Add any interactive features here
-            document.addEventListener('DOMContentLoaded', function() {
-                // Make plots responsive
-                window.onresize = function() {
-                    Plotly.Plots.resize();
-                };
-            });
-        </script>
-    </body>
-    </html>
-    """
+    </div>
+    <script>
+        // Add any interactive features here
+        document.addEventListener('DOMContentLoaded', function() {
+            // Make plots responsive
+            window.onresize = function() {
+                Plotly.Plots.resize();
+            };
+        });
+    </script>
+</body>
+</html>
+"""
+
+# Compile the Jinja template once per process, not per export click
+_REPORT_TEMPLATE = Template(_REPORT_TEMPLATE_SRC)
+
+def export_to_html(figs: List[go.Figure], insights: List[str], data: Dict) -> str:
+    """Convert dashboard to HTML with enhanced styling"""
     
-    # Convert figures to HTML
-    plot_htmls = [fig.to_html(full_html=False, include_plotlyjs=False) for fig in figs if fig is not None]
+    # Convert figures to HTML in parallel; each serialization is independent
+    built = [fig for fig in figs if fig is not None]
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(built)))) as ex:
+        plot_htmls = list(ex.map(
+            lambda fig: fig.to_html(full_html=False, include_plotlyjs=False, validate=False),
+            built))
     
     # Use the insights passed to the function instead of generating them here
-    template = Template(html_template)
-    html_content = template.render(
+    html_content = _REPORT_TEMPLATE.render(
         plots=plot_htmls,
         insights=insights,  # Use the insights passed to the function
         properties=data.get('properties', {}),
@@ -472,31 +571,29 @@ def export_to_html(figs: List[go.Figure], insights: List[str], data: Dict) -> st
     
     return html_content
 
-def get_binary_file_downloader_html(bin_file, file_label='File'):
-    """Generate download link for binary file"""
-    b64 = base64.b64encode(bin_file.encode()).decode()
-    return f'<a href="data:text/html;base64,{b64}" download="{file_label}.html">Download {file_label}</a>'
+@st.cache_resource
+def _client() -> OriginalityAI:
+    """One OriginalityAI client (and its pooled HTTP session) shared across reruns"""
+    return initialize_client()
 
+@st.cache_data(ttl=3600, max_entries=64, persist="disk", show_spinner=False)
 def process_text_input(text: str) -> Dict:
     """
-    Process input text using OriginalityAI API and return results
+    Process input text using OriginalityAI API and return results.
+    Cached on the text so Streamlit reruns don't re-hit the API
+    (or burn scan credits) for an unchanged input.
     """
     try:
-        # Initialize the API client
-        client = initialize_client()
-        
-        # Perform the scan
+        # Initialize the API client (cached resource, reused across reruns)
+        client = _client()
+
+        # Perform the scan; raise on failure so st.cache_data never stores
+        # (and replays) a transient network error for this text
         result = client.new_scan(text)
-        
-        # Save results to temporary files
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as formatted_file:
-            formatted_file.write(format_results(result))
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as raw_file:
-            json.dump(result, raw_file, indent=2, ensure_ascii=False)
-            
+        if "error" in result:
+            raise Exception(result["error"])
         return result
-        
+
     except Exception as e:
         raise Exception(f"Error processing text: {str(e)}")
 
@@ -512,7 +609,7 @@ def main():
         uploaded_file = st.file_uploader("Upload JSON result file", type=['json'], key="json_uploader")
         if uploaded_file is not None:
             try:
-                data = json.load(uploaded_file)
+                data = orjson.loads(uploaded_file.getvalue())
                 display_analysis(data)
             except Exception as e:
                 st.error(f"Error analyzing JSON file: {str(e)}")
@@ -543,10 +640,41 @@ def main():
             else:
                 st.warning("Please enter some text to analyze")
 
+def _ai_score_styles(df: pd.DataFrame) -> pd.DataFrame:
+    """CSS bands for the ai_score column (red >75, yellow >50), vectorized"""
+    css = pd.DataFrame('', index=df.index, columns=df.columns)
+    score = df['ai_score'].to_numpy()
+    css['ai_score'] = np.select(
+        [score > 75, score > 50],
+        ['background-color: #ffcccc', 'background-color: #ffffcc'],
+        default='')
+    return css
+
 def display_analysis(data: Dict):
     """Display analysis results using the OriginalityVisualizer"""
     visualizer = OriginalityVisualizer(data)
-    
+
+    # Rebuild figures, insights and the block table only when the payload
+    # fingerprint changes; widget-triggered reruns reuse session_state
+    key = visualizer._data_key
+    if st.session_state.get('last_key') != key:
+        st.session_state['figs'] = {
+            'ai': visualizer.plot_ai_detection_results(),
+            'readability': visualizer.plot_readability_metrics(),
+            'text_stats': visualizer.plot_text_statistics(),
+            'complexity': visualizer.plot_sentence_complexity(),
+            'plagiarism': visualizer.plot_plagiarism_metrics(),
+            'readability_details': visualizer.plot_readability_details(),
+            'timeline': visualizer.plot_readability_timeline(),
+            'heatmap': visualizer.plot_sentence_heatmap()
+        }
+        st.session_state['insights'] = visualizer.generate_detailed_insights()
+        st.session_state['df_ai'] = visualizer.analyze_ai_blocks()
+        st.session_state['last_key'] = key
+
+    figs = st.session_state['figs']
+    insights = st.session_state['insights']
+
     # Display document properties
     st.header("Document Properties")
     if 'properties' in data:
@@ -564,7 +692,7 @@ def display_analysis(data: Dict):
     col1, col2 = st.columns(2)
     
     with col1:
-        ai_fig = visualizer.plot_ai_detection_results()
+        ai_fig = figs['ai']
         if ai_fig:
             st.plotly_chart(ai_fig, use_container_width=True)
     
@@ -587,40 +715,32 @@ def display_analysis(data: Dict):
     col1, col2 = st.columns(2)
     
     with col1:
-        read_fig = visualizer.plot_readability_metrics()
+        read_fig = figs['readability']
         if read_fig:
             st.plotly_chart(read_fig, use_container_width=True)
     
     with col2:
-        text_fig = visualizer.plot_text_statistics()
+        text_fig = figs['text_stats']
         if text_fig:
             st.plotly_chart(text_fig, use_container_width=True)
     
     # Sentence Complexity
     st.header("Sentence Complexity")
-    comp_fig = visualizer.plot_sentence_complexity()
+    comp_fig = figs['complexity']
     if comp_fig:
         st.plotly_chart(comp_fig, use_container_width=True)
     
     # AI Block Analysis
     st.header("Detailed AI Detection by Text Block")
-    df = visualizer.analyze_ai_blocks()
+    df = st.session_state['df_ai']
     if not df.empty:
-        # Add color highlighting based on AI score
-        def highlight_ai_score(val):
-            if val > 75:
-                return 'background-color: #ffcccc'
-            elif val > 50:
-                return 'background-color: #ffffcc'
-            return ''
-        
-        # Use .map instead of .applymap
-        styled_df = df.style.map(highlight_ai_score, subset=['ai_score'])
+        # Banded highlighting computed in one vectorized pass, not per cell
+        styled_df = df.style.apply(_ai_score_styles, axis=None)
         st.dataframe(styled_df, use_container_width=True)
     
     # Add Plagiarism Analysis
     st.header("Plagiarism Analysis")
-    plag_fig = visualizer.plot_plagiarism_metrics()
+    plag_fig = figs['plagiarism']
     if plag_fig:
         st.plotly_chart(plag_fig, use_container_width=True)
         
@@ -632,48 +752,37 @@ def display_analysis(data: Dict):
     
     # Add Detailed Readability Analysis
     st.header("Detailed Readability Analysis")
-    read_detail_fig = visualizer.plot_readability_details()
+    read_detail_fig = figs['readability_details']
     if read_detail_fig:
         st.plotly_chart(read_detail_fig, use_container_width=True)
     
     # Add new visualizations
     st.header("Text Analysis Timeline")
-    timeline_fig = visualizer.plot_readability_timeline()
+    timeline_fig = figs['timeline']
     if timeline_fig:
         st.plotly_chart(timeline_fig, use_container_width=True)
     
     st.header("Sentence Complexity Heatmap")
-    heatmap_fig = visualizer.plot_sentence_heatmap()
+    heatmap_fig = figs['heatmap']
     if heatmap_fig:
         st.plotly_chart(heatmap_fig, use_container_width=True)
     
     # Update export functionality to include new visualizations
     if st.button("Generate HTML Report"):
-        visualizer = OriginalityVisualizer(data)  # Make sure visualizer is defined
-        figures = [
-            visualizer.plot_ai_detection_results(),
-            visualizer.plot_readability_metrics(),
-            visualizer.plot_text_statistics(),
-            visualizer.plot_sentence_complexity(),
-            visualizer.plot_plagiarism_metrics(),
-            visualizer.plot_readability_details(),
-            visualizer.plot_readability_timeline(),
-            visualizer.plot_sentence_heatmap()
-        ]
-        
-        # Get insights from the visualizer
-        insights = visualizer.generate_detailed_insights()
-        
-        # Generate HTML with detailed insights
-        html_content = export_to_html(figures, insights, data)
-        
-        # Create download link
-        html_download = get_binary_file_downloader_html(html_content, "analysis_report")
-        st.markdown(html_download, unsafe_allow_html=True)
+        # Reuse the cached figures and insights instead of rebuilding them
+        html_content = export_to_html(list(figs.values()), insights, data)
+        
+        # Stream the report bytes directly instead of a base64 data URI
+        st.download_button("Download analysis_report.html",
+                           data=html_content.encode('utf-8'),
+                           file_name="analysis_report.html",
+                           mime="text/html")
     
-    # Raw JSON Viewer
-    if st.checkbox("Show Raw JSON"):
-        st.json(data)
+    # Raw JSON Viewer: st.code is a flat syntax-highlighted render, far
+    # cheaper than the interactive tree st.json expands for large payloads
+    with st.expander("Show Raw JSON", expanded=False):
+        st.code(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode(),
+                language='json')
 
 if __name__ == "__main__":
     main()